@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 from contextlib import contextmanager
+from functools import cached_property
 from importlib import import_module
 from pathlib import Path
 from typing import TYPE_CHECKING, Callable, Optional, cast
@@ -19,7 +20,7 @@ from . import api, db, util
 from .api import Status
 from .capture import CaptureCollection
 from .context import ContextProvider
-from .filemap import FileMap, FileMapTemplate
+from .filemap import FileMapTemplate
 from .plotting import Plot
 from .schema import CaseSchema, PluginSchema, load
 from .script import Script, ScriptTemplate
@@ -142,7 +143,7 @@ class Case:
             configpath = localpath
             localpath = configpath.parent
         elif localpath.is_dir() and casedata is None:
-            for candidate in ["grevling.gold", "grevling.yaml", "badger.yaml"]:
+            for candidate in ["grevling.gold", "grevling.yaml", "grevling.json", "badger.yaml"]:
                 if (localpath / candidate).exists():
                     configpath = localpath / candidate
                     break
@@ -363,13 +364,16 @@ class Case:
 
     def create_instances(self) -> Iterable[Instance]:
         base_ctx = {"g_sourcedir": str(Path.cwd())}
+
+        # Look up all pre-existing instances in one query, rather than issuing
+        # (and autoflushing) a separate query for every point in the sweep
+        existing = {dbo.index: dbo for dbo in self.session.scalars(sql.select(db.Instance))}
+
         for i, ctx in enumerate(self.context_mgr.fullspace(context=base_ctx)):
             ctx["g_logdir"] = self._logdir(ctx)
 
             # TODO(Eivind): Think more about this
-            db_instance = self.session.scalar(
-                sql.select(db.Instance).where(db.Instance.index == ctx["g_index"])
-            )
+            db_instance = existing.pop(ctx["g_index"], None)
             if db_instance is not None:
                 Instance(self, db_instance).destroy()
 
@@ -487,8 +491,10 @@ class Instance:
         with self.local_book.open_str("status.txt", "w") as f:
             f.write(value.value)
 
-    @property
+    @cached_property
     def context(self) -> api.Context:
+        # The context is fixed when the instance is created, so it's safe to
+        # wrap it only once, instead of copying it on every access
         return api.Context(self.dbo.context)
 
     @property
@@ -526,13 +532,16 @@ class Instance:
     def index(self) -> int:
         return self.dbo.index
 
-    @property
+    @cached_property
     def script(self) -> Script:
+        # Rendered once per instance: it's used both for running and capturing
         return self._case.script.render(self.context)
 
-    def write_context(self) -> None:
+    def write_context(self, context: Optional[api.Context] = None) -> None:
+        if context is None:
+            context = self.context
         with self.local_book.open_str("context.json", "w") as f:
-            f.write(self.context.json(sort_keys=True, indent=4))
+            f.write(context.json(sort_keys=True, indent=4))
 
     def open_workspace(self, workspaces: api.WorkspaceCollection, name: str = "") -> api.Workspace:
         return workspaces.open_workspace(self.logdir, name)
@@ -551,29 +560,35 @@ class Instance:
         self.commit()
 
     def download(self) -> None:
+        assert self.status == Status.Finished
+        self.finish_download(self.fetch(self.context))
+
+    def fetch(self, context: api.Context) -> CaptureCollection:
+        """Copy logs and output files from the remote workspace to the local
+        one, and return a collector filled with the basic run information.
+        This doesn't touch the database (which is why the context must be
+        passed explicitly), so it may be called from a worker thread.
+        """
         assert self.remote
         assert self.remote_book
-        assert self.status == Status.Finished
 
         collector = CaptureCollection(self.types)
-        collector.update(self.context)
+        collector.update(context)
 
-        bookmap = FileMap.everything()
-        bookmap.copy(self.context, self.remote_book, self.local_book)
+        self.remote_book.copy_all_to(self.local_book)
         collector.collect_from_info(self.local_book)
 
         ignore_missing = self._case._ignore_missing or not collector["g_success"]
-        postmap = self._case.postmap.render(self.context)
-        postmap.copy(self.context, self.remote, self.local, ignore_missing=ignore_missing)
+        postmap = self._case.postmap.render(context)
+        postmap.copy(context, self.remote, self.local, ignore_missing=ignore_missing)
+        return collector
 
-        self._case.script.render(self.context).capture(collector, self.local_book)
-        collector.commit_to_file(self.local_book)
+    def finish_download(self, collector: CaptureCollection) -> None:
+        self.finish_capture(collector)
 
         self.status = Status.Downloaded
         self._case.has_collected = False
         self._case.has_plotted = False
-
-        self.dbo.captured = collector
         self.commit()
 
     def capture(self) -> None:
@@ -581,11 +596,17 @@ class Instance:
         collector = CaptureCollection(self.types)
         collector.update(self.context)
         collector.collect_from_info(self.local_book)
-        self._case.script.render(self.context).capture(collector, self.local_book)
-        collector.commit_to_file(self.local_book)
+        self.finish_capture(collector)
+        self.commit()
 
+    def finish_capture(self, collector: CaptureCollection) -> None:
+        """Run the script captures against the local book and store the
+        results, both in the book and on the database object. The caller is
+        responsible for committing.
+        """
+        self.script.capture(collector, self.local_book)
+        collector.commit_to_file(self.local_book)
         self.dbo.captured = collector
-        self.commit()
 
     def cached_capture(self, raw: bool = False) -> CaptureCollection:
         assert self.dbo.captured is not None
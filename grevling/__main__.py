@@ -93,7 +93,7 @@ def plugin():
 
 
 @main.command("run-all")
-@click.option("-j", "nprocs", default=1, type=int)
+@click.option("-j", "nprocs", default=1, type=int, envvar="GREVLING_JOBS")
 @workflows
 @click.pass_context
 def run_all(ctx: click.Context, workflow: str, nprocs: int):
@@ -115,7 +115,7 @@ def run_all(ctx: click.Context, workflow: str, nprocs: int):
 
 
 @main.command("run")
-@click.option("-j", "nprocs", default=1, type=int)
+@click.option("-j", "nprocs", default=1, type=int, envvar="GREVLING_JOBS")
 @workflows
 @click.pass_context
 def run(ctx: click.Context, workflow: str, nprocs: int):
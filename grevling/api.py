@@ -1,15 +1,19 @@
 from __future__ import annotations
 
 import json
+import os
+import re
 from abc import ABC, abstractmethod
 from enum import Enum
-from fnmatch import fnmatch
+from fnmatch import translate
+from functools import lru_cache
 from pathlib import Path
 from typing import (
     IO,
     TYPE_CHECKING,
     Any,
     BinaryIO,
+    Callable,
     Optional,
     Protocol,
     TextIO,
@@ -37,6 +41,19 @@ PathStr = Union[Path, str]
 T = TypeVar("T")
 
 
+# Chunk size used when streaming file contents between workspaces
+COPY_BUFSIZE = 1024 * 1024
+
+
+@lru_cache(maxsize=1024)
+def glob_matcher(pattern: str) -> Callable[[PathStr], bool]:
+    """Compile a glob pattern to a predicate on paths. This follows the same
+    rules as fnmatch, but each pattern is only translated once per process.
+    """
+    regex = re.compile(translate(os.path.normcase(pattern)))
+    return lambda path: regex.match(os.path.normcase(str(path))) is not None
+
+
 class Status(Enum):
     Created = "created"
     Prepared = "prepared"
@@ -74,7 +91,7 @@ class Workspace(ABC):
         ...
 
     @abstractmethod
-    def files(self) -> Iterator[Path]:
+    def files(self, under: Optional[PathStr] = None) -> Iterator[Path]:
         ...
 
     @abstractmethod
@@ -106,10 +123,24 @@ class Workspace(ABC):
         ...
 
     def glob(self, pattern: str) -> Iterator[Path]:
-        for path in self.files():
-            if fnmatch(str(path), pattern):
+        yield from self.match(glob_matcher(pattern))
+
+    def match(self, matcher: Callable[[PathStr], bool], under: Optional[PathStr] = None) -> Iterator[Path]:
+        for path in self.files(under):
+            if matcher(path):
                 yield path
 
+    def copy_stream(self, path: PathStr, target: Workspace, target_path: PathStr) -> None:
+        with self.open_bytes(path) as f:
+            target.write_file(target_path, f)
+        mode = self.mode(path)
+        if mode is not None:
+            target.set_mode(target_path, mode)
+
+    def copy_all_to(self, target: Workspace) -> None:
+        for path in self.files():
+            self.copy_stream(path, target, path)
+
 
 class WorkspaceCollection(ABC):
     @abstractmethod
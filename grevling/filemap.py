@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from pathlib import Path
+import re
+from functools import lru_cache
+from pathlib import Path, PurePath
 from typing import TYPE_CHECKING, Callable, Optional, TypedDict
 
 from . import api, util
@@ -18,12 +20,34 @@ class CopyKwargs(TypedDict, total=False):
     ignore_missing: bool
 
 
+GLOB_CHARS = re.compile(r"[*?[]")
+
+
+@lru_cache(maxsize=1024)
+def split_glob(pattern: str) -> tuple[str, str]:
+    """Split a glob pattern into a literal directory prefix and the remaining
+    pattern. Any path matching the pattern must lie under the prefix, which is
+    empty if the first component already contains wildcards.
+    """
+    parts = PurePath(pattern).parts
+    index = max(len(parts) - 1, 0)
+    for i, part in enumerate(parts[:-1]):
+        if GLOB_CHARS.search(part):
+            index = i
+            break
+    prefix = str(PurePath(*parts[:index])) if index > 0 else ""
+    return prefix, str(PurePath(*parts[index:]))
+
+
 class SingleFileMap:
     source: str
     target: str
     template: bool
     mode: str
 
+    _prefix: str
+    _matcher: Callable[[api.PathStr], bool]
+
     @staticmethod
     def from_schema(schema: FileMapSchema) -> SingleFileMap:
         return SingleFileMap(
@@ -53,6 +77,12 @@ class SingleFileMap:
         self.template = template
         self.mode = mode
 
+        # File maps are rebuilt for every instance, so the glob processing is
+        # memoized by pattern
+        if mode == "glob":
+            self._prefix, _ = split_glob(source)
+            self._matcher = api.glob_matcher(source)
+
     def iter_paths(self, context: api.Context, source: api.Workspace) -> Iterable[tuple[Path, Path]]:
         if self.mode == "simple":
             if source.type_of(self.source) == api.PathType.Folder:
@@ -63,7 +93,12 @@ class SingleFileMap:
                 yield (Path(self.source), Path(self.target))
 
         elif self.mode == "glob":
-            for path in source.glob(self.source):
+            prefix = self._prefix
+            if ".." in PurePath(prefix).parts:
+                # Workspace paths never leave the workspace, so nothing matches
+                return
+            under = prefix if prefix and not Path(prefix).is_absolute() else None
+            for path in source.match(self._matcher, under=under):
                 yield (path, Path(self.target) / path)
 
     def copy(
@@ -84,13 +119,12 @@ class SingleFileMap:
             util.log.debug(f"{source.name}/{sourcepath} -> {target.name}/{targetpath}")
 
             if not self.template:
-                with source.open_bytes(sourcepath) as f:
-                    target.write_file(targetpath, f)
+                source.copy_stream(sourcepath, target, targetpath)
+                continue
 
-            else:
-                with source.open_bytes(sourcepath) as f:
-                    text = f.read().decode()
-                target.write_file(targetpath, render(text, context).encode())
+            with source.open_bytes(sourcepath) as f:
+                text = f.read().decode()
+            target.write_file(targetpath, render(text, context).encode())
 
             mode = source.mode(sourcepath)
             if mode is not None:
@@ -106,10 +140,6 @@ class FileMap:
     def from_schema(schema: list[FileMapSchema]) -> FileMap:
         return FileMap([SingleFileMap.from_schema(entry) for entry in schema])
 
-    @staticmethod
-    def everything() -> FileMap:
-        return FileMap([SingleFileMap(source="*", mode="glob")])
-
     def __init__(self, elements: list[SingleFileMap]):
         self.elements = elements
 
@@ -120,7 +150,11 @@ class FileMap:
         target: api.Workspace,
         **kwargs: Unpack[CopyKwargs],
     ) -> bool:
-        return all(mapper.copy(context, source, target, **kwargs) for mapper in self.elements)
+        for mapper in self.elements:
+            if not mapper.copy(context, source, target, **kwargs):
+                util.log.error(f"File mapping failed: {mapper.source} -> {mapper.target}")
+                return False
+        return True
 
 
 class FileMapTemplate:
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from collections.abc import Iterable, Sequence
-from typing import Any, Union, overload
+from functools import lru_cache
+from typing import Any, Callable, Union, overload
 
 import numpy as np
 
@@ -16,19 +17,16 @@ from .schema import (
 
 class Parameter(Sequence):
     name: str
-    values: list[Any]
+    values: Union[list[Any], np.ndarray]
 
     @staticmethod
     def from_schema(name: str, schema: ParameterSchema) -> Parameter:
-        if isinstance(schema, ListedParameterSchema):
-            return Parameter(name, schema.values)
-        if isinstance(schema, UniformParameterSchema):
-            return UniformParameter(name, schema.interval, schema.num)
-        if isinstance(schema, GradedParameterSchema):
-            return GradedParameter(name, schema.interval, schema.num, schema.grading)
-        return None
-
-    def __init__(self, name: str, values: list):
+        constructor = CONSTRUCTORS.get(type(schema))
+        if constructor is None:
+            raise TypeError(f"unknown parameter schema: {type(schema)}")
+        return constructor(name, schema)
+
+    def __init__(self, name: str, values: Union[list, np.ndarray]):
         self.name = name
         self.values = values
 
@@ -47,20 +45,59 @@ class Parameter(Sequence):
         return self.values[index]
 
 
+# Parameters are rebuilt whenever a case is loaded, and identical definitions
+# are common, so the value arrays are memoized. They are shared between
+# parameters and must therefore be read-only.
+
+
+@lru_cache(maxsize=1024)
+def uniform_values(interval: tuple[float, float], num: int) -> np.ndarray:
+    values = np.linspace(*interval, num=num)
+    values.setflags(write=False)
+    return values
+
+
+@lru_cache(maxsize=1024)
+def graded_values(interval: tuple[float, float], num: int, grading: float) -> np.ndarray:
+    lo, hi = interval
+    step = (hi - lo) * (1 - grading) / (1 - grading ** (num - 1))
+    # Accumulate steps and values in the same order as a sequential loop
+    # would, so that the values are reproducible to the last bit
+    steps = np.full(num, grading, dtype=float)
+    steps[0] = step
+    np.multiply.accumulate(steps[:-1], out=steps[:-1])
+    values = np.empty(num)
+    values[0] = lo
+    values[1:] = steps[:-1]
+    np.add.accumulate(values, out=values)
+    values.setflags(write=False)
+    return values
+
+
 class UniformParameter(Parameter):
+    values: np.ndarray
+
     def __init__(self, name: str, interval: tuple[float, float], num: int):
-        super().__init__(name, list(np.linspace(*interval, num=num)))
+        lo, hi = interval
+        super().__init__(name, uniform_values((lo, hi), num))
 
 
 class GradedParameter(Parameter):
+    values: np.ndarray
+
     def __init__(self, name: str, interval: tuple[float, float], num: int, grading: float):
         lo, hi = interval
-        step = (hi - lo) * (1 - grading) / (1 - grading ** (num - 1))
-        values = [lo]
-        for _ in range(num - 1):
-            values.append(values[-1] + step)
-            step *= grading
-        super().__init__(name, values)
+        super().__init__(name, graded_values((lo, hi), num, grading))
+
+
+# Parameter constructors, by the refined schema type they accept
+CONSTRUCTORS: dict[type, Callable[[str, Any], Parameter]] = {
+    ListedParameterSchema: lambda name, schema: Parameter(name, schema.values),
+    UniformParameterSchema: lambda name, schema: UniformParameter(name, schema.interval, schema.num),
+    GradedParameterSchema: lambda name, schema: GradedParameter(
+        name, schema.interval, schema.num, schema.grading
+    ),
+}
 
 
 class ParameterSpace(dict):
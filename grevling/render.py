@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import re
 import shlex
+from functools import lru_cache
 from typing import TYPE_CHECKING, Optional, TypeVar, Union
 
 from mako.template import Template
@@ -13,12 +15,24 @@ def quote_shell(text):
     return shlex.quote(text)
 
 
+# Bound format methods for common precisions, so that templates don't have to
+# build and parse a new format spec for every substitution
+RND_FORMATS = {n: f"{{:.{n}f}}".format for n in range(20)}
+SCI_FORMATS = {n: f"{{:.{n}e}}".format for n in range(20)}
+
+
 def rnd(number, ndigits):
-    return f"{number:.{ndigits}f}"
+    fmt = RND_FORMATS.get(ndigits)
+    if fmt is None:
+        return f"{number:.{ndigits}f}"
+    return fmt(number)
 
 
 def sci(number, ndigits):
-    return f"{number:.{ndigits}e}"
+    fmt = SCI_FORMATS.get(ndigits)
+    if fmt is None:
+        return f"{number:.{ndigits}e}"
+    return fmt(number)
 
 
 QUOTERS = {
@@ -47,7 +61,8 @@ def render(template: T, context: api.Context, mode: Optional[str] = None) -> T:
     return None
 
 
-def render_str(template: str, context: api.Context, mode: Optional[str] = None) -> str:
+@lru_cache(maxsize=4096)
+def compile_str(template: str, mode: Optional[str] = None) -> Template:
     filters = ["str"]
     imports = [
         "from numpy import sin, cos",
@@ -56,5 +71,25 @@ def render_str(template: str, context: api.Context, mode: Optional[str] = None)
         filters.append(f"quote_{mode}")
         imports.append(f"from grevling.render import quote_{mode}")
 
-    mako = Template(template, default_filters=filters, imports=imports)
+    return Template(template, default_filters=filters, imports=imports)
+
+
+# Anything that Mako might interpret: expressions, tags, control lines,
+# comments and escaped newlines. A lone carriage return is also taken to start
+# a line, to err on the side of rendering.
+MAKO_SYNTAX = re.compile(r"\$\{|</?%|(?:^|(?<=\r))[ \t]*(?:%|##)|\\\r?$", re.MULTILINE)
+
+
+@lru_cache(maxsize=4096)
+def is_literal(template: str) -> bool:
+    """Check whether a template would render to itself, regardless of
+    context.
+    """
+    return MAKO_SYNTAX.search(template) is None
+
+
+def render_str(template: str, context: api.Context, mode: Optional[str] = None) -> str:
+    if is_literal(template):
+        return template
+    mako = compile_str(template, mode)
     return mako.render(**context, rnd=rnd, sci=sci)
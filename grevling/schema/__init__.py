@@ -20,10 +20,10 @@ which return validated models when called with a context as argument.
 """
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, cast
 
-import goldpy as gold  # type: ignore
 import yaml
 
 from grevling import util
@@ -32,6 +32,16 @@ from . import raw, refined
 from .refined import *  # noqa: F403
 
 
+@lru_cache(maxsize=1)
+def grevling_library() -> dict[str, Any]:
+    """Evaluate the 'grevling.gold' helper file. This is done at most once
+    per process.
+    """
+    import goldpy as gold  # type: ignore
+
+    return cast(dict[str, Any], gold.eval_file(str(Path(__file__).parent.parent / "grevling.gold")))
+
+
 def libfinder(path: str) -> Optional[dict[str, Any]]:
     """This function is called when a Gold script imports a module which
     Gold doesn't know about. We provide this to allow user scripts to import
@@ -39,28 +49,50 @@ def libfinder(path: str) -> Optional[dict[str, Any]]:
     """
     if path != "grevling":
         return None
-    retval = gold.eval_file(str(Path(__file__).parent.parent / "grevling.gold"))
 
     # Additional utility functions implemented in Python
     return {
-        **retval,
+        **grevling_library(),
         "legendre": util.legendre,
     }
 
 
+@lru_cache(maxsize=64)
+def load_static(path: str, mtime: int, size: int) -> raw.CaseSchema:
+    """Parse and validate a YAML or JSON configuration file. The modification
+    time and size are only used as cache keys, so that unchanged files are
+    parsed at most once per process.
+    """
+    p = Path(path)
+
+    # JSON is parsed and validated in one go by pydantic
+    if p.suffix.lower() == ".json":
+        return raw.CaseSchema.model_validate_json(p.read_bytes())
+
+    with p.open() as f:
+        data = yaml.load(f, Loader=yaml.CSafeLoader)
+    return raw.CaseSchema.model_validate(data)
+
+
 def load(path: Path) -> refined.CaseSchema:
     """Load a Grevling configuration file and return a refined schema."""
 
     # We recommend new cases are written in Gold, thus we require that YAML
-    # files are explicitly named as such
-    if path.suffix.lower() in (".yaml", ".yml"):
-        with path.open() as f:
-            data = yaml.load(f, Loader=yaml.CLoader)
-    else:
-        with path.open() as f:
-            src = f.read()
-        resolver = gold.ImportConfig(root=str(path.parent), custom=libfinder)
-        data = gold.eval(src, resolver)
+    # (and JSON) files are explicitly named as such
+    if path.suffix.lower() in (".yaml", ".yml", ".json"):
+        # These formats can't import anything, so the file itself is the only
+        # thing that can invalidate a cached result
+        st = path.stat()
+        return load_static(str(path.resolve()), st.st_mtime_ns, st.st_size).refine()
+
+    # Gold is only needed for Gold files, so don't pay for importing it when
+    # the schema module is imported
+    import goldpy as gold  # type: ignore
+
+    with path.open() as f:
+        src = f.read()
+    resolver = gold.ImportConfig(root=str(path.parent), custom=libfinder)
+    data = gold.eval(src, resolver)
 
     # return raw.CaseSchema.model_validate(data).refine()
     obj = raw.CaseSchema.model_validate(data)
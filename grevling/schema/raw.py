@@ -10,13 +10,15 @@ their outputs must necessarily be delayed.
 
 from __future__ import annotations
 
+import shlex
 from functools import partial
-from typing import TYPE_CHECKING, Any, Callable, Literal, Optional, TypeVar, Union
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Any, Callable, Literal, Optional, TypeVar, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, BeforeValidator, Field, PrivateAttr, model_validator
 
 from grevling import api, util
-from grevling.render import render
+from grevling.render import is_literal, render, render_str
 
 from . import refined
 
@@ -53,6 +55,13 @@ class RegexCaptureSchema(BaseModel):
         """
         return RegexCaptureSchema(pattern=pattern)
 
+    def refine(self) -> refined.RegexCaptureSchema:
+        return refined.RegexCaptureSchema.model_construct(
+            capture_type=self.capture_type,
+            pattern=self.pattern,
+            mode=self.mode,
+        )
+
 
 class SimpleCaptureSchema(BaseModel):
     """'Simple' captures are easier to configure than regular expressions,
@@ -68,19 +77,43 @@ class SimpleCaptureSchema(BaseModel):
     flexible_prefix: bool = False
     mode: Literal["first", "last", "all"] = "last"
 
+    def refine(self) -> refined.SimpleCaptureSchema:
+        return refined.SimpleCaptureSchema.model_construct(
+            capture_type=self.capture_type,
+            kind=self.kind,
+            name=self.name,
+            prefix=self.prefix,
+            skip_words=self.skip_words,
+            flexible_prefix=self.flexible_prefix,
+            mode=self.mode,
+        )
+
+
+def tag_capture(value: Any) -> Any:
+    """Captures in config files don't name their own type, so infer it. Bare
+    strings are regular expressions, and mappings with a 'type' key (but no
+    pattern) are simple captures. This lets pydantic dispatch on the
+    *capture_type* tag instead of trying each model in turn.
+    """
+    if isinstance(value, str):
+        return {"capture_type": "regex", "pattern": value}
+    if isinstance(value, dict) and "capture_type" not in value:
+        tag = "simple" if "type" in value and "pattern" not in value else "regex"
+        return {**value, "capture_type": tag}
+    return value
+
+
+CaptureEntrySchema = Annotated[
+    Union[SimpleCaptureSchema, RegexCaptureSchema],
+    Field(discriminator="capture_type"),
+    BeforeValidator(tag_capture),
+]
+
 
 # Captures should conform to this type when written in the config file
 CaptureSchema = Union[
-    str,
-    SimpleCaptureSchema,
-    RegexCaptureSchema,
-    list[
-        Union[
-            str,
-            SimpleCaptureSchema,
-            RegexCaptureSchema,
-        ]
-    ],
+    CaptureEntrySchema,
+    list[CaptureEntrySchema],
 ]
 
 
@@ -108,7 +141,25 @@ class FileMapBaseSchema(BaseModel):
         return cls.model_validate(source)
 
     def refine(self) -> refined.FileMapSchema:
-        return refined.FileMapSchema.model_validate(self.model_dump())
+        # This runs for every instance, and the fields are already validated
+        # (or rendered from validated templates), so skip validation
+        return refined.FileMapSchema.model_construct(
+            source=self.source,
+            target=self.target,
+            mode=self.mode,
+            template=self.template,
+        )
+
+    def render_refine(self, context: api.Context) -> refined.FileMapSchema:
+        """Equivalent to ``self.render(context).refine()``, but without
+        creating the intermediate raw model.
+        """
+        return refined.FileMapSchema.model_construct(
+            source=render(self.source, context),
+            target=render(self.target, context) if self.target else None,
+            mode=self.mode,
+            template=self.template,
+        )
 
     def render(self, context: api.Context) -> Self:
         """Perform template substitution in the *source* and *target*
@@ -146,6 +197,7 @@ class CommandSchema(BaseModel):
     container: Optional[str] = None
     container_args: Union[str, list[str]] = []
     allow_failure: bool = False
+    parallel: bool = False
     workdir: Optional[str] = None
 
     @staticmethod
@@ -154,15 +206,40 @@ class CommandSchema(BaseModel):
         importantly, this interprets raw strings and lists of strings as
         commands with only the *command* attribute set.
         """
-        if isinstance(source, CommandSchema):
-            return source
-        if isinstance(source, dict):
-            return CommandSchema.model_validate(source)
-        return CommandSchema.model_validate({"command": source})
+        constructor = COMMAND_CONSTRUCTORS.get(type(source))
+        if constructor is None:
+            constructor = next(
+                (func for kind, func in COMMAND_CONSTRUCTORS.items() if isinstance(source, kind)),
+                COMMAND_CONSTRUCTORS[str],
+            )
+        return constructor(source)
+
+    def deduced_name(self) -> str:
+        """Return the name of the command, which unless given explicitly is
+        deduced from the executable in the same way as for runtime commands.
+        """
+        if self.name:
+            return self.name
+        command = shlex.split(self.command) if isinstance(self.command, str) else self.command
+        return Path(command[0]).name if command else "TODO"
+
+    def is_literal(self) -> bool:
+        """Check whether rendering would leave this command unchanged,
+        regardless of context.
+        """
+        templates: list[Optional[str]] = [self.workdir, *self.env.values()]
+        for value in (self.command, self.container_args):
+            templates.extend(value if isinstance(value, list) else [value])
+        return all(template is None or is_literal(template) for template in templates)
 
     def render(self, context: api.Context) -> CommandSchema:
         """Perform template substitution in the attributes that require it."""
 
+        # Raw schemas are never mutated, so a command without templates can
+        # be shared between all contexts
+        if self.is_literal():
+            return self
+
         # If commands are provided as strings instead of lists, templates must
         # be rendered in shell mode for proper quoting.
         cmd_render_mode = "shell" if isinstance(self.command, str) else None
@@ -177,31 +254,43 @@ class CommandSchema(BaseModel):
             }
         )
 
-    def refine_capture(self) -> list[dict]:
-        """Convert the *capture* attribute so that it can be loaded by the
-        refined models.
-        """
+    def refine_capture(self) -> list[Union[refined.SimpleCaptureSchema, refined.RegexCaptureSchema]]:
+        """Convert the *capture* attribute to a list of refined models."""
 
         # Convert to list if not already a list
         raw_captures = self.capture if isinstance(self.capture, list) else [self.capture]
 
-        # Strings should be interpreted as regex capture patterns
-        return [
-            RegexCaptureSchema.from_str(pattern).model_dump()
-            if isinstance(pattern, str)
-            else pattern.model_dump()
-            for pattern in raw_captures
-        ]
+        return [pattern.refine() for pattern in raw_captures]
 
     def refine(self) -> refined.CommandSchema:
-        return refined.CommandSchema.model_validate(
-            {
-                **self.model_dump(),
-                "capture": self.refine_capture(),
-            }
+        # This runs for every command of every instance, and the fields are
+        # already validated (or rendered from validated templates), so skip
+        # validation
+        return refined.CommandSchema.model_construct(
+            command=self.command,
+            name=self.name,
+            capture=self.refine_capture(),
+            allow_failure=self.allow_failure,
+            retry_on_fail=self.retry_on_fail,
+            parallel=self.parallel,
+            env=self.env,
+            container=self.container,
+            container_args=self.container_args,
+            workdir=self.workdir,
         )
 
 
+# Command constructors, by the type of the raw source. Exact types are looked
+# up directly, subclasses by isinstance. Any other source is taken to be the
+# command itself, as for strings.
+COMMAND_CONSTRUCTORS: dict[type, Callable[[Any], CommandSchema]] = {
+    CommandSchema: lambda source: source,
+    dict: CommandSchema.model_validate,
+    str: lambda source: CommandSchema.model_validate({"command": source}),
+    list: lambda source: CommandSchema.model_validate({"command": source}),
+}
+
+
 class UniformParameterSchema(BaseModel):
     """Model for uniformly sampled parameters"""
 
@@ -210,7 +299,11 @@ class UniformParameterSchema(BaseModel):
     num: int
 
     def refine(self) -> refined.UniformParameterSchema:
-        return refined.UniformParameterSchema.model_validate(self.model_dump())
+        return refined.UniformParameterSchema.model_construct(
+            kind=self.kind,
+            interval=self.interval,
+            num=self.num,
+        )
 
 
 class GradedParameterSchema(BaseModel):
@@ -224,15 +317,23 @@ class GradedParameterSchema(BaseModel):
     grading: Scalar
 
     def refine(self) -> refined.GradedParameterSchema:
-        return refined.GradedParameterSchema.model_validate(self.model_dump())
+        return refined.GradedParameterSchema.model_construct(
+            kind=self.kind,
+            interval=self.interval,
+            num=self.num,
+            grading=self.grading,
+        )
 
 
-# Parameter specifications in the config file should conform to this type
+# Parameter specifications in the config file should conform to this type.
+# Mappings are dispatched on their 'type' key rather than tried in turn.
 ParameterSchema = Union[
     list[Scalar],
     list[str],
-    UniformParameterSchema,
-    GradedParameterSchema,
+    Annotated[
+        Union[UniformParameterSchema, GradedParameterSchema],
+        Field(discriminator="kind"),
+    ],
 ]
 
 
@@ -244,6 +345,9 @@ class PlotCategorySchema(BaseModel):
     mode: Literal["category"]
     argument: Optional[Literal["color", "line", "marker"]] = Field(alias="style", default=None)
 
+    def refine(self) -> refined.PlotModeCategorySchema:
+        return refined.PlotModeCategorySchema.model_construct(mode=self.mode, argument=self.argument)
+
 
 class PlotIgnoreSchema(BaseModel):
     """Model for specifying that a parameter should be ignored in plots."""
@@ -251,12 +355,18 @@ class PlotIgnoreSchema(BaseModel):
     mode: Literal["ignore"]
     argument: Optional[Union[Scalar, str]] = Field(alias="value", default=None)
 
+    def refine(self) -> refined.PlotModeIgnoreSchema:
+        return refined.PlotModeIgnoreSchema.model_construct(mode=self.mode, argument=self.argument)
+
 
-# Parameter plot modes in the config file should conform to this type
+# Parameter plot modes in the config file should conform to this type.
+# Mappings are dispatched on their 'mode' key rather than tried in turn.
 PlotModeSchema = Union[
     Literal["fixed", "variate", "category", "ignore", "mean"],
-    PlotCategorySchema,
-    PlotIgnoreSchema,
+    Annotated[
+        Union[PlotCategorySchema, PlotIgnoreSchema],
+        Field(discriminator="mode"),
+    ],
 ]
 
 
@@ -273,12 +383,10 @@ class PlotStyleSchema(BaseModel):
         def fix(x: Optional[Union[str, list[str]]]) -> Optional[list[str]]:
             return [x] if isinstance(x, str) else x
 
-        return refined.PlotStyleSchema.model_validate(
-            {
-                "color": fix(self.color),
-                "line": fix(self.line),
-                "marker": fix(self.marker),
-            }
+        return refined.PlotStyleSchema.model_construct(
+            color=fix(self.color),
+            line=fix(self.line),
+            marker=fix(self.marker),
         )
 
 
@@ -308,19 +416,19 @@ class PlotSchema(BaseModel):
     def refine_yaxis(self) -> list[str]:
         return self.yaxis if isinstance(self.yaxis, list) else [self.yaxis]
 
-    def refine_parameters(self) -> dict[str, dict]:
+    def refine_parameters(self) -> dict[str, Union[dict, refined.PlotModeSchema]]:
         """Convert the *parameters* attribute so that it can be loaded by the
         refined models.
         """
         return {
-            name: {"mode": value} if isinstance(value, str) else value.model_dump()
+            name: {"mode": value} if isinstance(value, str) else value.refine()
             for name, value in self.parameters.items()
         }
 
     def refine(self) -> refined.PlotSchema:
         return refined.PlotSchema.model_validate(
             {
-                **self.model_dump(),
+                **self.__dict__,
                 "fmt": self.refine_fmt(),
                 "yaxis": self.refine_yaxis(),
                 "style": self.style.refine(),
@@ -341,14 +449,18 @@ class SettingsSchema(BaseModel):
         by refined models.
         """
         logdir = self.logdir
+        if isinstance(logdir, str) and is_literal(logdir):
+            return lambda ctx: logdir
         if isinstance(logdir, str):
-            return lambda ctx: render(logdir, ctx)
+            # Bind the string renderer directly, skipping the type dispatch in
+            # render() for every instance
+            return partial(render_str, logdir)
         return lambda ctx: logdir(**ctx)
 
     def refine(self) -> refined.SettingsSchema:
         return refined.SettingsSchema.model_validate(
             {
-                **self.model_dump(),
+                **self.__dict__,
                 "logdir": self.refine_logdir(),
             }
         )
@@ -371,7 +483,7 @@ class PluginSchema(BaseModel):
     settings: Any = None
 
     def refine(self) -> refined.PluginSchema:
-        return refined.PluginSchema.model_validate(self.model_dump())
+        return refined.PluginSchema.model_construct(name=self.name, settings=self.settings)
 
 
 FSchema = TypeVar("FSchema", TemplateSchema, FileMapSchema)
@@ -400,6 +512,31 @@ class CaseSchema(BaseModel):
 
     plugins: list[Union[str, PluginSchema]] = []
 
+    # Refinement is deterministic, and the loader may hand out the same raw
+    # schema many times, so the result is kept. This is only safe because
+    # case schemas are never copied or rendered.
+    _refined: Optional[refined.CaseSchema] = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def check_parallel_names(self) -> Self:
+        """Commands running in parallel write output files named after
+        themselves at the same time, so they must have distinct names. Scripts
+        given as callables are checked when they are evaluated.
+        """
+        if not isinstance(self.p_script, list):
+            return self
+        names: set[str] = set()
+        for schema in self.p_script:
+            command = CommandSchema.from_any(schema)
+            if not command.parallel:
+                names.clear()
+                continue
+            name = command.deduced_name()
+            if name in names:
+                raise ValueError(f"commands running in parallel must have distinct names: {name}")
+            names.add(name)
+        return self
+
     def refine_parameters(self) -> dict[str, Union[dict, refined.ParameterSchema]]:
         """Convert the *parameters* attribute so that raw lists are converted to
         objects when refining.
@@ -407,10 +544,10 @@ class CaseSchema(BaseModel):
         parameters: dict[str, Union[dict, refined.ParameterSchema]] = {}
         for name, schema in self.parameters.items():
             if isinstance(schema, list):
-                parameters[name] = {
-                    "kind": "listed",
-                    "values": schema,
-                }
+                parameters[name] = refined.ListedParameterSchema.model_construct(
+                    kind="listed",
+                    values=list(schema),
+                )
             else:
                 parameters[name] = schema.refine()
         return parameters
@@ -421,7 +558,9 @@ class CaseSchema(BaseModel):
         """
         p_script = self.p_script
         if isinstance(p_script, list):
-            return lambda ctx: [CommandSchema.from_any(schema).render(ctx).refine() for schema in p_script]
+            # Parse the command schemas up front, only rendering remains per context
+            commands = [CommandSchema.from_any(schema) for schema in p_script]
+            return lambda ctx: [command.render(ctx).refine() for command in commands]
         return lambda ctx: [CommandSchema.from_any(schema).refine() for schema in p_script(**ctx)]
 
     def refine_evaluate(self) -> Callable[[api.Context], dict[str, Any]]:
@@ -450,7 +589,8 @@ class CaseSchema(BaseModel):
     ) -> Callable[[api.Context], list[refined.FileMapSchema]]:
         """Helper method for converting filemaps to refined models."""
         if isinstance(schemas, list):
-            return lambda ctx: [schema_converter(schema).render(ctx).refine() for schema in schemas]
+            converted = [schema_converter(schema) for schema in schemas]
+            return lambda ctx: [schema.render_refine(ctx) for schema in converted]
         return lambda ctx: [schema_converter(schema).refine() for schema in schemas(**ctx)]
 
     def templates_callable(self) -> Callable[[api.Context], list[refined.FileMapSchema]]:
@@ -465,6 +605,16 @@ class CaseSchema(BaseModel):
         """Combine the *templates* and *prefiles* attributes into a callable
         so that it's accepted by the refined model.
         """
+        p_prefiles, p_templates = self.p_prefiles, self.p_templates
+        if isinstance(p_prefiles, list) and isinstance(p_templates, list):
+            # Both are static, so convert them into one sequence up front and
+            # produce the combined list in a single pass per context
+            converted: list[FileMapBaseSchema] = [
+                *(FileMapSchema.from_any(schema) for schema in p_prefiles),
+                *(TemplateSchema.from_any(schema) for schema in p_templates),
+            ]
+            return lambda ctx: [schema.render_refine(ctx) for schema in converted]
+
         prefiles = self.prefiles_callable()
         templates = self.templates_callable()
         return lambda ctx: [*prefiles(ctx), *templates(ctx)]
@@ -489,9 +639,11 @@ class CaseSchema(BaseModel):
         ]
 
     def refine(self) -> refined.CaseSchema:
-        return refined.CaseSchema.model_validate(
+        if self._refined is not None:
+            return self._refined
+        self._refined = refined.CaseSchema.model_validate(
             {
-                **self.model_dump(),
+                **self.__dict__,
                 "parameters": self.refine_parameters(),
                 "script": self.refine_script(),
                 "evaluate": self.refine_evaluate(),
@@ -503,3 +655,4 @@ class CaseSchema(BaseModel):
                 "plugins": self.refine_plugins(),
             }
         )
+        return self._refined
@@ -79,6 +79,7 @@ class CommandSchema(BaseModel):
     capture: list[CaptureSchema]
     allow_failure: bool
     retry_on_fail: bool
+    parallel: bool
     env: dict[str, str]
     container: Optional[str]
     container_args: Union[str, list[str]]
@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import asyncio
 import datetime
+import logging
 import os
 import shlex
-from collections import namedtuple
 from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from itertools import groupby
 from pathlib import Path
 from time import time as osclock
 from typing import TYPE_CHECKING, Callable, Optional
@@ -27,12 +29,31 @@ def time() -> Iterator[Callable[[], float]]:
     end = osclock()
 
 
-Result = namedtuple("Result", ["stdout", "stderr", "returncode"])
+@lru_cache(maxsize=1024)
+def split(command: str) -> tuple[str, ...]:
+    # The same command strings are typically parsed for every instance
+    return tuple(shlex.split(command))
 
 
-async def run(command: list[str], shell: bool, env: dict[str, str], cwd: Path) -> Result:
+@dataclass(frozen=True)
+class Result:
+    stderr: bytes
+    returncode: int
+
+
+# Maximal number of bytes read from a subprocess' stdout at a time
+STDOUT_CHUNKSIZE = 1 << 16
+
+
+async def run(
+    command: list[str], shell: bool, env: dict[str, str], cwd: Path, stdout: Callable[[bytes], None]
+) -> Result:
+    # Standard output is passed to *stdout* in chunks as it arrives, so that
+    # it's never held in memory in full
     kwargs = {
-        "env": {**os.environ, **env},
+        # Without overrides the child inherits our environment, with no need
+        # to copy it
+        "env": {**os.environ, **env} if env else None,
         "cwd": cwd,
         "stdout": asyncio.subprocess.PIPE,
         "stderr": asyncio.subprocess.PIPE,
@@ -44,20 +65,46 @@ async def run(command: list[str], shell: bool, env: dict[str, str], cwd: Path) -
     else:
         proc = await asyncio.create_subprocess_exec(*command, **kwargs)  # type: ignore
 
+    try:
+        remaining_stdout, stderr = await communicate(proc, stdout)
+    except asyncio.CancelledError:
+        # Don't leave the process running if we're no longer interested
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+
+    if remaining_stdout:
+        stdout(remaining_stdout)
+    assert proc.returncode is not None
+    return Result(stderr, proc.returncode)
+
+
+async def communicate(
+    proc: asyncio.subprocess.Process, stdout: Callable[[bytes], None]
+) -> tuple[bytes, bytes]:
     assert proc.stdout is not None
 
-    stdout = b""
+    # Splitting and decoding lines is only necessary for debug output
+    debug = util.log.isEnabledFor(logging.DEBUG)
+
+    # Partial line at the end of the last chunk, to be logged when complete
+    pending = b""
     with util.log.with_context("stdout"):
         while True:
-            line = await proc.stdout.readline()
-            if not line:
+            chunk = await proc.stdout.read(STDOUT_CHUNKSIZE)
+            if not chunk:
                 break
-            stdout += line
-            util.log.debug(line.decode().rstrip())
+            stdout(chunk)
+            if not debug:
+                continue
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                util.log.debug(line.decode().rstrip())
+        if pending:
+            util.log.debug(pending.decode().rstrip())
 
-    remaining_stdout, stderr = await proc.communicate()
-    stdout += remaining_stdout
-    return Result(stdout, stderr, proc.returncode)
+    return await proc.communicate()
 
 
 @dataclass(frozen=True)
@@ -73,6 +120,7 @@ class Command:
     shell: bool
     retry_on_fail: bool
     allow_failure: bool
+    parallel: bool
 
     captures: list[Capture]
 
@@ -81,7 +129,7 @@ class Command:
         args = schema.model_dump(exclude={"command", "name", "capture", "container_args"})
 
         if isinstance(schema.command, str):
-            args["command"] = shlex.split(schema.command)
+            args["command"] = list(split(schema.command))
             args["shell"] = True
         else:
             args["command"] = schema.command
@@ -95,13 +143,29 @@ class Command:
         args["captures"] = [Capture.from_schema(entry) for entry in schema.capture]
 
         if isinstance(schema.container_args, str):
-            args["container_args"] = shlex.split(schema.container_args)
+            args["container_args"] = list(split(schema.container_args))
         else:
             args["container_args"] = schema.container_args
 
         return Command(**args)
 
-    async def execute(self, cwd: Path, log_ws: api.Workspace) -> bool:
+    @cached_property
+    def quoted_command(self) -> str:
+        # Commands are fixed once created, so they only need to be quoted once
+        return shlex.join(self.command or [])
+
+    @cached_property
+    def docker_command(self) -> tuple[list[str], list[str]]:
+        # Only the volume mount depends on the working directory, so the rest
+        # of the container command is built once
+        assert self.container is not None
+        prefix = ["docker", "run", *self.container_args]
+        suffix = ["--workdir", "/workdir", self.container]
+        if self.command:
+            suffix.extend(["sh", "-c", self.quoted_command])
+        return prefix, suffix
+
+    async def execute(self, cwd: Path, log_ws: api.Workspace, log: list[str]) -> bool:
         kwargs = {
             "cwd": cwd,
             "shell": self.shell,
@@ -113,29 +177,25 @@ class Command:
 
         command = self.command
         if self.container:
-            docker_command = [
-                "docker",
-                "run",
-                *self.container_args,
-                f"-v{cwd}:/workdir",
-                "--workdir",
-                "/workdir",
-                self.container,
-            ]
-            if command:
-                docker_command.extend(["sh", "-c", " ".join(shlex.quote(c) for c in command)])
+            prefix, suffix = self.docker_command
             kwargs["shell"] = False
-            command = docker_command
+            command = [*prefix, f"-v{cwd}:/workdir", *suffix]
 
         if not command:
             util.log.error("No command available")
             return False
 
-        util.log.debug(" ".join(shlex.quote(c) for c in command))
+        if util.log.isEnabledFor(logging.DEBUG):
+            util.log.debug(shlex.join(command))
+
+        stdout_path = f"{self.name}.stdout"
+        kwargs["stdout"] = lambda chunk: log_ws.write_file(stdout_path, chunk, append=True)
 
         # TODO(Eivind): How to get good timings when we run async?
         with time() as get_duration:
             while True:
+                # Output from a failed attempt is discarded
+                log_ws.write_file(stdout_path, b"")
                 result = await run(command, **kwargs)  # type: ignore
                 if self.retry_on_fail and result.returncode:
                     util.log.info("Failed, retrying...")
@@ -143,9 +203,8 @@ class Command:
                 break
         duration = get_duration()
 
-        log_ws.write_file(f"{self.name}.stdout", result.stdout)
         log_ws.write_file(f"{self.name}.stderr", result.stderr)
-        log_ws.write_file("grevling.txt", f"g_walltime_{self.name}={duration}\n", append=True)
+        log.append(f"g_walltime_{self.name}={duration}\n")
 
         if result.returncode:
             level = util.log.warn if self.allow_failure else util.log.error
@@ -171,21 +230,48 @@ class Command:
 class Script:
     commands: list[Command]
 
+    def __post_init__(self) -> None:
+        # Parallel commands write output files named after themselves at the
+        # same time, so they must not share names
+        for group in self.groups():
+            names = [cmd.name for cmd in group]
+            if len(set(names)) < len(names):
+                raise ValueError(f"commands running in parallel must have distinct names: {', '.join(names)}")
+
     @staticmethod
     def from_schema(schema: list[CommandSchema]) -> Script:
         return Script([Command.from_schema(entry) for entry in schema])
 
+    def groups(self) -> Iterator[list[Command]]:
+        # Consecutive parallel commands run together, all others one by one
+        for parallel, group in groupby(self.commands, key=lambda cmd: cmd.parallel):
+            if parallel:
+                yield list(group)
+            else:
+                yield from ([cmd] for cmd in group)
+
     async def run(self, cwd: Path, log_ws: api.Workspace) -> bool:
-        log_ws.write_file("grevling.txt", f"g_started={datetime.datetime.now()}\n", append=True)
+        # Log lines are collected and written in one go at the end
+        log = [f"g_started={datetime.datetime.now()}\n"]
         try:
-            for cmd in self.commands:
-                if not await cmd.execute(cwd, log_ws):
-                    log_ws.write_file("grevling.txt", "g_success=0\n", append=True)
+            for group in self.groups():
+                tasks = [asyncio.ensure_future(cmd.execute(cwd, log_ws, log)) for cmd in group]
+                try:
+                    results = await asyncio.gather(*tasks)
+                except BaseException:
+                    # Stop the other commands in the group if one of them raised
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                    raise
+                if not all(results):
+                    log.append("g_success=0\n")
                     return False
-            log_ws.write_file("grevling.txt", "g_success=1\n", append=True)
+            log.append("g_success=1\n")
             return True
         finally:
-            log_ws.write_file("grevling.txt", f"g_finished={datetime.datetime.now()}\n", append=True)
+            log.append(f"g_finished={datetime.datetime.now()}\n")
+            log_ws.write_file("grevling.txt", "".join(log), append=True)
 
     def capture(self, collector: CaptureCollection, workspace: api.Workspace) -> None:
         for cmd in self.commands:
@@ -11,6 +11,7 @@ if TYPE_CHECKING:
     from collections.abc import Iterable
 
     from grevling import Case, Instance
+    from grevling.capture import CaptureCollection
 
 from grevling import api, util
 
@@ -136,15 +137,30 @@ class DownloadResults(PipeSegment):
     workspaces: api.WorkspaceCollection
     case: Case
 
-    def __init__(self, workspaces: api.WorkspaceCollection, case: Case):
-        super().__init__()
+    def __init__(self, workspaces: api.WorkspaceCollection, case: Case, ncopies: int = 1):
+        super().__init__(ncopies)
         self.workspaces = workspaces
         self.case = case
 
+    # File transfers run in a worker thread so that several downloads can
+    # proceed concurrently. The log context is frame-based, so it must be
+    # re-established on the thread's side. Anything backed by the database
+    # (the index and the context) is resolved beforehand on the event loop
+    # thread, since the session isn't thread-safe.
+    @util.with_context("I {index}")
+    @util.with_context("Down")
+    def fetch(self, instance: Instance, index: int, context: api.Context) -> CaptureCollection:
+        return instance.fetch(context)
+
     @util.with_context("I {instance.index}")
     @util.with_context("Down")
     async def apply(self, instance: Instance) -> Instance:
+        assert instance.status == api.Status.Finished
         with instance.bind_remote(self.workspaces):
-            instance.download()
-        self.workspaces.destroy_workspace(instance.logdir)
+            collector = await asyncio.to_thread(self.fetch, instance, instance.index, instance.context)
+            instance.finish_download(collector)
+
+        # Removing the remote workspace is pure file system work, and may
+        # overlap with the next download
+        await asyncio.to_thread(self.workspaces.destroy_workspace, instance.logdir)
         return instance
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import errno
+import os
 import shutil
 import stat
+import sys
 import tempfile
+import threading
 from contextlib import contextmanager
 from pathlib import Path
-from typing import IO, TYPE_CHECKING, BinaryIO, Optional, TextIO, Union
+from typing import IO, TYPE_CHECKING, BinaryIO, Callable, Optional, TextIO, Union
+from weakref import WeakValueDictionary
 
 from grevling import api, util
 from grevling.api import PathType, Status
@@ -19,6 +24,82 @@ if TYPE_CHECKING:
     from grevling import Case, Instance
 
 
+# Errors indicating that a kernel copy mechanism is unsupported for the given
+# file descriptors, rather than an actual I/O failure
+_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP}
+
+# Upper limit on bytes per kernel copy call
+_MAX_KERNEL_CHUNK = 2**30
+
+
+def _kernel_copy(infd: int, outfd: int, size: int) -> bool:
+    """Copy from *infd* to *outfd* without passing through user space, using
+    copy_file_range or sendfile. Copying continues until end of file, as
+    *size* may be unreliable (e.g. for pseudo-files). Returns false if the
+    copy should be completed by a buffered copy, which happens when neither
+    method is usable, when nothing could be copied, or when fewer than *size*
+    bytes were copied. The file offsets are advanced by what was copied.
+    """
+    methods: list[Callable[[int], int]] = []
+    if hasattr(os, "copy_file_range"):
+        methods.append(lambda n: os.copy_file_range(infd, outfd, n))
+    if sys.platform.startswith("linux"):
+        methods.append(lambda n: os.sendfile(outfd, infd, None, n))
+
+    blocksize = min(max(size, 2**23), _MAX_KERNEL_CHUNK)
+    for method in methods:
+        copied = 0
+        try:
+            while n := method(blocksize):
+                copied += n
+        except OSError as err:
+            if copied > 0 or err.errno not in _FALLBACK_ERRNOS:
+                raise
+            continue
+        return copied > 0 and copied >= size
+    return False
+
+
+def _fastcopy(src: Path, dst: Path, copy_mode: bool = False) -> None:
+    """Copy the contents of *src* to *dst*, preferring in-kernel copies and
+    falling back to a buffered copy. If *copy_mode* is true, also copy the
+    permission bits, using the stat result already obtained for the copy.
+    """
+    with src.open("rb") as fsrc, dst.open("wb") as fdst:
+        st = os.fstat(fsrc.fileno())
+        if not _kernel_copy(fsrc.fileno(), fdst.fileno(), st.st_size):
+            shutil.copyfileobj(fsrc, fdst, length=api.COPY_BUFSIZE)
+        if not copy_mode:
+            return
+        if hasattr(os, "fchmod"):
+            os.fchmod(fdst.fileno(), stat.S_IMODE(st.st_mode))
+            return
+    dst.chmod(stat.S_IMODE(st.st_mode))
+
+
+def _write_bytes(path: Path, data: bytes, append: bool = False) -> None:
+    """Write *data* to *path* with raw file descriptor calls, skipping the
+    buffered file object machinery, which is pure overhead for small writes.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0)
+    flags |= os.O_APPEND if append else os.O_TRUNC
+    fd = os.open(path, flags, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
+
+def _copytree_function(src: str, dst: str) -> str:
+    """Copy function for *shutil.copytree*, copying contents and permission
+    bits only. Timestamps and other metadata are not needed by Grevling.
+    """
+    _fastcopy(Path(src), Path(dst), copy_mode=True)
+    return dst
+
+
 class RunInstance(PipeSegment):
     name = "Run"
 
@@ -62,16 +143,26 @@ class LocalWorkflow(api.Workflow):
         return Pipeline(
             PrepareInstance(self.workspaces),
             RunInstance(self.workspaces, ncopies=self.nprocs),
-            DownloadResults(self.workspaces, case),
+            DownloadResults(self.workspaces, case, ncopies=self.nprocs),
         )
 
 
 class LocalWorkspaceCollection(api.WorkspaceCollection):
     root: Path
 
+    # Workspaces that are currently open, by path and name. The references are
+    # weak, so that workspaces of instances no longer in use are released.
+    _workspaces: WeakValueDictionary[tuple[str, str], LocalWorkspace]
+
+    # Workspaces are opened on the event loop thread but may be destroyed from
+    # a worker thread, so access to the cache is serialized
+    _lock: threading.Lock
+
     def __init__(self, root: Union[str, Path], name: str = ""):
         self.root = Path(root)
         self.name = name
+        self._workspaces = WeakValueDictionary()
+        self._lock = threading.Lock()
 
     def __enter__(self) -> LocalWorkspaceCollection:
         return self
@@ -89,13 +180,21 @@ class LocalWorkspaceCollection(api.WorkspaceCollection):
         return LocalWorkspace(path, name)
 
     def open_workspace(self, path: str, name: str = "") -> LocalWorkspace:
-        subpath = self.root / path
-        subpath.mkdir(parents=True, exist_ok=True)
-        return LocalWorkspace(subpath, name)
+        with self._lock:
+            workspace = self._workspaces.get((path, name))
+            if workspace is None:
+                subpath = self.root / path
+                subpath.mkdir(parents=True, exist_ok=True)
+                workspace = self._workspaces[(path, name)] = LocalWorkspace(subpath, name)
+        return workspace
 
     def destroy_workspace(self, path: str) -> None:
-        subpath = self.root / path
-        shutil.rmtree(subpath)
+        # Drop cached handles before removing anything
+        with self._lock:
+            for key in list(self._workspaces):
+                if key[0] == path:
+                    self._workspaces.pop(key, None)
+        shutil.rmtree(self.root / path)
 
     def workspace_names(self, name: str = "") -> Iterable[str]:
         for path in self.root.iterdir():
@@ -107,15 +206,30 @@ class LocalWorkspace(api.Workspace):
     root: Path
     name: str
 
+    # Subspaces that have already been created, by path and name
+    _subspaces: dict[tuple[str, str], LocalWorkspace]
+
+    # Directories known to exist, so that repeated writes skip the mkdir calls
+    _created_dirs: set[Path]
+
     def __init__(self, root: Union[str, Path], name: str = ""):
         self.root = Path(root)
         self.name = name
+        self._subspaces = {}
+        self._created_dirs = set()
 
     def __str__(self) -> str:
         return str(self.root)
 
     def destroy(self) -> None:
         shutil.rmtree(self.root)
+        self._subspaces.clear()
+        self._created_dirs.clear()
+
+    def ensure_dir(self, path: Path) -> None:
+        if path not in self._created_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(path)
 
     def to_root(self, path: Optional[Union[Path, str]]) -> Path:
         if path is None:
@@ -133,34 +247,68 @@ class LocalWorkspace(api.Workspace):
 
     @contextmanager
     def open_bytes(self, path: Union[Path, str], mode: str = "rb") -> Generator[BinaryIO, None, None]:
-        with self.to_root(path).open(mode) as f:
+        # Readers either slurp the whole file or copy it in large chunks, so
+        # a read buffer would only add an extra copy of the data
+        buffering = 0 if mode == "rb" else -1
+        with self.to_root(path).open(mode, buffering=buffering) as f:
             yield f  # type: ignore
 
     def write_file(
         self, path: Union[Path, str], source: Union[str, bytes, IO, Path], append: bool = False
     ) -> None:
         target = self.to_root(path)
-        target.parent.mkdir(parents=True, exist_ok=True)
+        self.ensure_dir(target.parent)
 
         if isinstance(source, Path):
-            shutil.copyfile(source, target)
+            _fastcopy(source, target)
             return
 
         if isinstance(source, str):
             source = source.encode()
 
+        if isinstance(source, bytes):
+            _write_bytes(target, source, append=append)
+            return
+
         mode = "ab" if append else "wb"
         with self.open_bytes(path, mode) as f:
-            if isinstance(source, bytes):
-                f.write(source)
-            else:
-                shutil.copyfileobj(source, f)
+            shutil.copyfileobj(source, f, length=api.COPY_BUFSIZE)
+
+    def copy_stream(
+        self, path: Union[Path, str], target: api.Workspace, target_path: Union[Path, str]
+    ) -> None:
+        if not isinstance(target, LocalWorkspace):
+            super().copy_stream(path, target, target_path)
             return
+        dst = target.to_root(target_path)
+        target.ensure_dir(dst.parent)
+        _fastcopy(self.to_root(path), dst, copy_mode=True)
 
-    def files(self) -> Iterator[Path]:
-        for path in self.root.rglob("*"):
-            if path.is_file():
-                yield path.relative_to(self.root)
+    def copy_all_to(self, target: api.Workspace) -> None:
+        if not isinstance(target, LocalWorkspace):
+            super().copy_all_to(target)
+            return
+        shutil.copytree(self.root, target.root, dirs_exist_ok=True, copy_function=_copytree_function)
+
+    def files(self, under: Optional[Union[Path, str]] = None) -> Iterator[Path]:
+        # Start from a subdirectory if requested, provided that it is reached
+        # without following symlinks, as in a full traversal
+        start = self.root
+        for part in Path(under).parts if under is not None else ():
+            start /= part
+            if start.is_symlink() or not start.is_dir():
+                return
+
+        # Use scandir directly: the entry types come from the directory
+        # listing itself, avoiding one or two extra stat calls per entry
+        stack = [start]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(Path(entry.path))
+                    elif entry.is_file():
+                        yield Path(entry.path).relative_to(self.root)
 
     def exists(self, path: Union[Path, str]) -> bool:
         return self.to_root(path).exists()
@@ -180,10 +328,13 @@ class LocalWorkspace(api.Workspace):
         self.to_root(path).chmod(stat.S_IMODE(mode))
 
     def subspace(self, path: str, name: str = "") -> api.Workspace:
-        name = name or str(path)
-        subpath = self.root / path
-        subpath.mkdir(exist_ok=True, parents=True)
-        return LocalWorkspace(subpath, name=f"{self.name}/{name}")
+        workspace = self._subspaces.get((path, name))
+        if workspace is None:
+            subpath = self.root / path
+            subpath.mkdir(exist_ok=True, parents=True)
+            fullname = f"{self.name}/{name or path}"
+            workspace = self._subspaces[(path, name)] = LocalWorkspace(subpath, name=fullname)
+        return workspace
 
     def top_name(self) -> str:
         return self.root.name
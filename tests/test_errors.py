@@ -22,6 +22,7 @@ ERRORFILES = [
     "templates1",
     "templates2",
     "templates3",
+    "parallel",
 ]
 
 
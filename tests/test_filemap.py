@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from grevling.api import Context
+from grevling.filemap import SingleFileMap, split_glob
+from grevling.workflow.local import LocalWorkspace
+
+
+@pytest.mark.parametrize(
+    "pattern, expected",
+    [
+        ("*.dat", ("", "*.dat")),
+        ("file.dat", ("", "file.dat")),
+        ("a/b/c/*.dat", (str(Path("a/b/c")), "*.dat")),
+        ("a/*/c/*.dat", ("a", str(Path("*/c/*.dat")))),
+        ("**/*.dat", ("", str(Path("**/*.dat")))),
+        ("a/**/*.dat", ("a", str(Path("**/*.dat")))),
+        ("../x/*.dat", (str(Path("../x")), "*.dat")),
+    ],
+)
+def test_split_glob(pattern, expected):
+    assert split_glob(pattern) == expected
+
+
+def test_glob_outside_source():
+    with TemporaryDirectory() as temp:
+        root = Path(temp) / "source"
+        (root / "x").mkdir(parents=True)
+        (root / "x" / "file.dat").write_text("")
+        (Path(temp) / "x").mkdir()
+        (Path(temp) / "x" / "file.dat").write_text("")
+
+        workspace = LocalWorkspace(root)
+        assert list(SingleFileMap("../x/*.dat", mode="glob").iter_paths(Context(), workspace)) == []
+        assert list(SingleFileMap("x/*.dat", mode="glob").iter_paths(Context(), workspace)) == [
+            (Path("x/file.dat"), Path("x/file.dat"))
+        ]
+
+
+def test_glob_broken_symlink():
+    # Entries that are neither files nor directories are skipped, whether or
+    # not the pattern has a literal prefix
+    with TemporaryDirectory() as temp:
+        root = Path(temp)
+        (root / "out").mkdir()
+        (root / "out" / "file.dat").write_text("")
+        (root / "out" / "broken.dat").symlink_to(root / "missing")
+
+        workspace = LocalWorkspace(root)
+        for pattern in ["*/*.dat", "out/*.dat"]:
+            paths = list(SingleFileMap(pattern, mode="glob").iter_paths(Context(), workspace))
+            assert paths == [(Path("out/file.dat"), Path("out/file.dat"))]
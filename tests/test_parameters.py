@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import pytest
+
+from grevling.parameters import GradedParameter
+
+
+# Values computed by sequential accumulation, which must be reproduced exactly
+# so that instance contexts are stable between versions
+@pytest.mark.parametrize(
+    "interval, num, grading, expected",
+    [
+        (
+            (0.0, 5.0),
+            10,
+            1.1,
+            [
+                0.0,
+                0.3682026953717172,
+                0.7732256602806061,
+                1.218750921680384,
+                1.7088287092201397,
+                2.247914275513871,
+                2.8409083984369756,
+                3.493201933652391,
+                4.210724822389348,
+                5.0,
+            ],
+        ),
+        (
+            (1.0, 5.0),
+            8,
+            0.8,
+            [
+                1.0,
+                2.0122932897102412,
+                2.822127921478434,
+                3.469995626892988,
+                3.9882897912246316,
+                4.402925122689946,
+                4.734633387862198,
+                4.999999999999999,
+            ],
+        ),
+    ],
+)
+def test_graded_values(interval, num, grading, expected):
+    assert list(GradedParameter("x", interval, num, grading)) == expected
+
+
+def test_shared_values():
+    a = GradedParameter("a", (0.0, 1.0), 5, 1.2)
+    b = GradedParameter("b", (0.0, 1.0), 5, 1.2)
+    assert a.values is b.values
+    assert not a.values.flags.writeable
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import shutil
 from pathlib import Path
+from tempfile import TemporaryDirectory
 
 import numpy as np
 import pytest
@@ -13,7 +15,16 @@ from grevling import Case
 DATADIR = Path(__file__).parent / "data"
 
 
-@pytest.mark.parametrize("suffix", [".yaml", ".gold"])
+@pytest.mark.parametrize("suffix", [".yaml", ".json"])
+def test_discover(suffix):
+    with TemporaryDirectory() as temp:
+        shutil.copy(DATADIR / "valid" / f"diverse{suffix}", Path(temp) / f"grevling{suffix}")
+        case = Case(temp)
+        assert case.configpath == Path(temp) / f"grevling{suffix}"
+        assert case.parameters["alpha"].values == [1, 2]
+
+
+@pytest.mark.parametrize("suffix", [".yaml", ".json", ".gold"])
 def test_parse(suffix):
     case = Case(DATADIR / "valid" / f"diverse{suffix}")
 
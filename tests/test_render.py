@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import pytest
+from mako.template import Template
+
+from grevling.render import is_literal
+
+
+@pytest.mark.parametrize(
+    "template, literal",
+    [
+        ("plain text", True),
+        ("100% done", True),
+        ("a ## b", True),
+        ("$HOME and {braces}", True),
+        ("a\\b", True),
+        ("${x}", False),
+        ("<%def name='f()'/>", False),
+        ("</%def>", False),
+        ("% if x:\n% endif", False),
+        ("a\n  % if x:\n% endif", False),
+        ("a\n%%", False),
+        ("## comment", False),
+        ("a\n\t## comment", False),
+        ("a\\", False),
+        ("a\\\nb", False),
+        ("a\\\r\nb", False),
+        ("a\r\n%%", False),
+        ("a\r\n## comment", False),
+        ("a\r%%", False),
+        ("a\r  ## comment", False),
+    ],
+)
+def test_is_literal(template, literal):
+    assert is_literal(template) == literal
+    if literal:
+        assert Template(template).render() == template
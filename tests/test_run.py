@@ -374,6 +374,18 @@ def test_sleep(suffix):
     assert duration < 18.0
 
 
+@pytest.mark.skipif(os.name == "nt" or shutil.which("sh") is None, reason="requires sh and *nix")
+@pytest.mark.parametrize("suffix", [".yaml", ".gold"])
+def test_parallel(suffix):
+    path = DATADIR / "run" / "parallel" / f"grevling{suffix}"
+    api_run()(path)
+
+    with Case(path) as case:
+        data = case.load_dataframe()
+
+    assert data["g_success"].tolist() == [True]
+
+
 @pytest.mark.skipif(os.name == "nt" or shutil.which("sh") is None, reason="requires sh and *nix")
 @pytest.mark.parametrize("suffix", [".yaml", ".gold"])
 def test_workdir(suffix):
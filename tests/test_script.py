@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+import shutil
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Optional
+
+import pytest
+
+from grevling.script import Command, Script
+from grevling.workflow.local import LocalWorkspace
+
+
+def parallel_command(name: str, command: list[str], workdir: Optional[str] = None) -> Command:
+    return Command(
+        name=name,
+        command=command,
+        env={},
+        workdir=workdir,
+        container=None,
+        container_args=[],
+        shell=False,
+        retry_on_fail=False,
+        allow_failure=False,
+        parallel=True,
+        captures=[],
+    )
+
+
+def test_parallel_names():
+    with pytest.raises(ValueError):
+        Script([parallel_command("a", ["true"]), parallel_command("a", ["true"])])
+
+
+@pytest.mark.skipif(shutil.which("sleep") is None, reason="requires sleep")
+def test_parallel_cancel(monkeypatch):
+    # The second command fails to start, which should stop the first one
+    procs = []
+    create = asyncio.create_subprocess_exec
+
+    async def create_subprocess_exec(*args, **kwargs):
+        # Make sure the slow command is running before the other one fails
+        while not procs and Path(kwargs["cwd"]).name == "nonexistent":
+            await asyncio.sleep(0.01)
+        proc = await create(*args, **kwargs)
+        procs.append(proc)
+        return proc
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", create_subprocess_exec)
+
+    with TemporaryDirectory() as temp:
+        script = Script(
+            [
+                parallel_command("slow", ["sleep", "10"]),
+                parallel_command("missing", ["true"], workdir=f"{temp}/nonexistent"),
+            ]
+        )
+        with pytest.raises(OSError):
+            asyncio.run(script.run(Path(temp), LocalWorkspace(Path(temp) / "log")))
+
+    # The slow process was killed and reaped before the error propagated
+    assert len(procs) == 1
+    assert procs[0].returncode is not None and procs[0].returncode < 0
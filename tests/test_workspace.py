@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from grevling.workflow.local import LocalWorkspace
+
+
+@pytest.mark.skipif(not Path("/proc/self/status").is_file(), reason="requires procfs")
+def test_write_pseudo_file():
+    # Pseudo-files report a size of zero, but have content
+    with TemporaryDirectory() as temp:
+        workspace = LocalWorkspace(temp)
+        workspace.write_file("status", Path("/proc/self/status"))
+        assert (Path(temp) / "status").read_text().startswith("Name:")
+
+
+def test_write_path():
+    with TemporaryDirectory() as temp:
+        source = Path(temp) / "source"
+        source.write_bytes(b"x" * 100000)
+        workspace = LocalWorkspace(Path(temp) / "target")
+        workspace.write_file("a/b", source)
+        assert (Path(temp) / "target" / "a" / "b").read_bytes() == b"x" * 100000